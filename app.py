@@ -10,9 +10,13 @@ import re
 import spacy
 import os
 
+from monitoring import APP_METRICS_PATH, ClassifierMonitor, load_training_distribution
+
 # --- Konfigurasi ---
 MODEL_PATH = os.path.join('models', 'diabetes_classifier.pkl')
 VECTORIZER_PATH = os.path.join('models', 'tfidf_vectorizer.pkl')
+# Set SERVE_METRICS=1 untuk membuka endpoint Prometheus /metrics (port METRICS_PORT)
+SERVE_METRICS = os.environ.get('SERVE_METRICS') == '1'
 
 # --- Fungsi Caching untuk Model ---
 @st.cache_resource
@@ -28,6 +32,21 @@ def load_model_and_vectorizer():
         st.info("Jalankan skrip 'train_model.py' terlebih dahulu untuk membuat file model.")
         return None, None, None
 
+@st.cache_resource
+def load_monitor(_vectorizer):
+    """Membuat monitor yang dipakai bersama oleh semua sesi aplikasi."""
+    monitor = ClassifierMonitor(
+        vocabulary=_vectorizer.vocabulary_,
+        analyzer=_vectorizer.build_analyzer(),
+        training_distribution=load_training_distribution()
+    )
+    if SERVE_METRICS:
+        try:
+            monitor.serve_metrics()
+        except OSError as e:
+            print(f"⚠️ Endpoint metrik tidak dapat dijalankan: {e}")
+    return monitor
+
 # --- Fungsi Preprocessing ---
 def preprocess_text(text, nlp):
     """
@@ -57,6 +76,8 @@ st.markdown("---")
 model, vectorizer, nlp = load_model_and_vectorizer()
 
 if model and vectorizer and nlp:
+    monitor = load_monitor(vectorizer)
+
     # Layout dua kolom
     col1, col2 = st.columns(2)
 
@@ -67,14 +88,19 @@ if model and vectorizer and nlp:
         if st.button("🔬 Klasifikasikan Teks"):
             if user_input.strip():
                 # Preprocess input
-                processed_input = preprocess_text(user_input, nlp)
+                with monitor.timed('preprocess'):
+                    processed_input = preprocess_text(user_input, nlp)
                 
-                # Vectorize input
-                input_vector = vectorizer.transform([processed_input])
+                with monitor.timed('inference'):
+                    # Vectorize input
+                    input_vector = vectorizer.transform([processed_input])
+                    
+                    # Prediksi
+                    prediction = model.predict(input_vector)
+                    prediction_proba = model.predict_proba(input_vector)
                 
-                # Prediksi
-                prediction = model.predict(input_vector)
-                prediction_proba = model.predict_proba(input_vector)
+                monitor.observe(prediction, prediction_proba, [processed_input])
+                monitor.write_metrics(APP_METRICS_PATH)
                 
                 # Tampilkan hasil di kolom kedua
                 with col2:
@@ -0,0 +1,88 @@
+"""
+Diabetes Insight Miner - Batch Scoring Script
+Mengklasifikasikan seluruh postingan yang telah dikumpulkan menggunakan model terlatih.
+"""
+
+import pandas as pd
+import joblib
+import os
+
+from parallel_preprocess import plan_shards, preprocess_parallel
+from monitoring import BATCH_METRICS_PATH, ClassifierMonitor, load_training_distribution
+
+# --- Konfigurasi ---
+MODEL_PATH = os.path.join('models', 'diabetes_classifier.pkl')
+VECTORIZER_PATH = os.path.join('models', 'tfidf_vectorizer.pkl')
+INPUT_PATH = 'data/reddit_posts.csv'
+OUTPUT_PATH = 'data/reddit_posts_scored.csv'
+N_WORKERS = os.cpu_count()
+
+
+def score_posts(df, model, vectorizer, n_workers=N_WORKERS, monitor=None):
+    """
+    Memberikan prediksi kategori untuk setiap postingan.
+
+    Args:
+        df: DataFrame postingan (kolom 'title' dan 'body')
+        model: Model klasifikasi terlatih
+        vectorizer: TF-IDF vectorizer terlatih
+        n_workers: Jumlah proses worker untuk preprocessing
+        monitor: ClassifierMonitor untuk mencatat prediksi dan latensi (opsional)
+
+    Returns:
+        DataFrame dengan kolom 'predicted_category' dan 'confidence'
+    """
+    texts = (df['title'].fillna('') + ' ' + df['body'].fillna('')).tolist()
+    monitor = monitor or ClassifierMonitor()
+
+    with monitor.timed('preprocess', len(texts)):
+        processed = preprocess_parallel(texts, n_workers=n_workers)
+
+    with monitor.timed('inference', len(texts)):
+        features = vectorizer.transform(processed)
+        proba = model.predict_proba(features)
+
+    scored = df.copy()
+    scored['predicted_category'] = model.classes_[proba.argmax(axis=1)]
+    scored['confidence'] = proba.max(axis=1)
+    monitor.observe(scored['predicted_category'], proba, processed)
+    return scored
+
+
+def main():
+    """Fungsi utama"""
+    print("🚀 Memulai batch scoring...")
+    print("="*50)
+
+    try:
+        model = joblib.load(MODEL_PATH)
+        vectorizer = joblib.load(VECTORIZER_PATH)
+        df = pd.read_csv(INPUT_PATH)
+        print(f"✅ Berhasil memuat {len(df)} postingan dari {INPUT_PATH}")
+    except FileNotFoundError as e:
+        print(f"❌ File tidak ditemukan: {e.filename}")
+        print("   Jalankan get_data.py dan train_model.py terlebih dahulu")
+        return
+
+    n_workers, _ = plan_shards(len(df), N_WORKERS)
+    print(f"🔄 Memproses dan mengklasifikasikan teks ({n_workers} worker)...")
+    monitor = ClassifierMonitor(
+        vocabulary=vectorizer.vocabulary_,
+        analyzer=vectorizer.build_analyzer(),
+        training_distribution=load_training_distribution()
+    )
+    scored = score_posts(df, model, vectorizer, monitor=monitor)
+
+    os.makedirs(os.path.dirname(OUTPUT_PATH), exist_ok=True)
+    scored.to_csv(OUTPUT_PATH, index=False, encoding='utf-8')
+    print(f"💾 Hasil scoring disimpan di: {OUTPUT_PATH}")
+    print("📊 Distribusi kategori prediksi:")
+    print(scored['predicted_category'].value_counts())
+
+    monitor.print_report()
+    monitor.write_metrics(BATCH_METRICS_PATH)
+    print(f"💾 Metrik monitoring disimpan di: {BATCH_METRICS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
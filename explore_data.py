@@ -10,6 +10,19 @@ import numpy as np
 from datetime import datetime
 import re
 import os
+import sys
+
+from post_store import query_posts, store_exists
+from incremental_stats import HyperLogLog, LOG_BIN_EDGES, TITLE_LENGTH_BIN_EDGES, update_aggregates
+
+# Kata kunci untuk setiap kategori
+CATEGORY_KEYWORDS = {
+    'Efek Samping Obat': ['side effect', 'medication', 'drug', 'metformin', 'insulin', 'dose', 'prescription'],
+    'Kesehatan Mental': ['depression', 'anxiety', 'stress', 'mental', 'therapy', 'counseling', 'support'],
+    'Manajemen Diet': ['diet', 'food', 'carb', 'sugar', 'meal', 'nutrition', 'eating', 'keto'],
+    'Dukungan & Motivasi': ['motivation', 'support', 'encouragement', 'success', 'progress', 'hope'],
+    'Teknologi & Monitoring': ['glucose', 'monitor', 'device', 'app', 'technology', 'sensor', 'pump']
+}
 
 def load_data(filename='data/reddit_posts.csv'):
     """Memuat data dari file CSV"""
@@ -150,14 +163,7 @@ def suggest_categories(df):
     print("🏷️  SARAN KATEGORI BERDASARKAN KONTEN")
     print("="*50)
     
-    # Kata kunci untuk setiap kategori
-    keywords = {
-        'Efek Samping Obat': ['side effect', 'medication', 'drug', 'metformin', 'insulin', 'dose', 'prescription'],
-        'Kesehatan Mental': ['depression', 'anxiety', 'stress', 'mental', 'therapy', 'counseling', 'support'],
-        'Manajemen Diet': ['diet', 'food', 'carb', 'sugar', 'meal', 'nutrition', 'eating', 'keto'],
-        'Dukungan & Motivasi': ['motivation', 'support', 'encouragement', 'success', 'progress', 'hope'],
-        'Teknologi & Monitoring': ['glucose', 'monitor', 'device', 'app', 'technology', 'sensor', 'pump']
-    }
+    keywords = CATEGORY_KEYWORDS
     
     # Analisis judul dan body
     all_text = ' '.join(df['title'].dropna().astype(str)).lower()
@@ -169,19 +175,167 @@ def suggest_categories(df):
         count = sum(all_text.count(word) for word in words)
         print(f"   {category}: {count} kemunculan")
     
+    print_labeling_suggestions()
+
+def print_labeling_suggestions():
+    """Menampilkan saran untuk pelabelan manual"""
     print("\n💡 SARAN UNTUK PELABELAN:")
     print("   1. Mulai dengan 200-300 postingan untuk pelabelan manual")
     print("   2. Fokus pada postingan dengan body yang lengkap")
     print("   3. Prioritaskan postingan dengan skor tinggi")
     print("   4. Gunakan kata kunci di atas sebagai panduan")
 
-def main():
-    """Fungsi utama"""
+def incremental_report(agg):
+    """Menampilkan laporan eksplorasi dari agregat partisi yang digabungkan"""
+    total = agg['count']
+    body_count = agg['body_count']
+    
+    print("\n" + "="*50)
+    print("📈 STATISTIK DASAR DATA")
+    print("="*50)
+    print(f"📊 Total postingan: {total}")
+    print(f"📅 Rentang waktu: {agg['created_min']} hingga {agg['created_max']}")
+    print(f"👥 Total author unik (estimasi): {HyperLogLog(registers=agg['author_hll']).count()}")
+    print(f"🏆 Rata-rata skor: {agg['score_sum']/total:.2f}")
+    print(f"💬 Rata-rata komentar: {agg['num_comments_sum']/total:.2f}")
+    print(f"📝 Postingan dengan body: {body_count} ({body_count/total*100:.1f}%)")
+    print(f"🔗 Postingan link: {agg['is_self_count']} ({agg['is_self_count']/total*100:.1f}%)")
+    
+    print("\n" + "="*50)
+    print("📝 ANALISIS KONTEN TEKS")
+    print("="*50)
+    if agg['title_count'] > 0:
+        print(f"📏 Panjang judul rata-rata: {agg['title_length_sum']/agg['title_count']:.1f} karakter")
+        print(f"📝 Kata dalam judul rata-rata: {agg['title_words_sum']/agg['title_count']:.1f} kata")
+    if body_count > 0:
+        print(f"📏 Panjang body rata-rata: {agg['body_length_sum']/body_count:.1f} karakter")
+        print(f"📝 Kata dalam body rata-rata: {agg['body_words_sum']/body_count:.1f} kata")
+    
+    print("\n🔝 TOP 10 KATA DALAM JUDUL:")
+    word_counts = pd.Series(agg['title_word_counts'], dtype=int).sort_values(ascending=False).head(10)
+    for i, (word, count) in enumerate(word_counts.items(), 1):
+        print(f"   {i:2d}. {word:15s} ({count:3d} kali)")
+    
+    show_sample_posts(pd.DataFrame(agg['top_posts']), n=len(agg['top_posts']))
+    
+    print("\n" + "="*50)
+    print("🏷️  SARAN KATEGORI BERDASARKAN KONTEN")
+    print("="*50)
+    print("📊 DISTRIBUSI KATEGORI BERDASARKAN KATA KUNCI:")
+    for category, count in agg['keyword_counts'].items():
+        print(f"   {category}: {count} kemunculan")
+    print_labeling_suggestions()
+
+def create_incremental_visualizations(agg):
+    """Membuat visualisasi dari bin histogram yang digabungkan"""
+    print("\n" + "="*50)
+    print("📊 MEMBUAT VISUALISASI")
+    print("="*50)
+    
+    plt.style.use('default')
+    sns.set_palette("husl")
+    os.makedirs('data/plots', exist_ok=True)
+    
+    log_edges = np.array(LOG_BIN_EDGES)
+    log_widths = np.diff(log_edges)
+    
+    plt.figure(figsize=(12, 8))
+    
+    # 1. Distribusi skor
+    plt.subplot(2, 2, 1)
+    plt.bar(log_edges[:-1], agg['score_hist'], width=log_widths, align='edge',
+            alpha=0.7, color='skyblue', edgecolor='black')
+    plt.title('Distribusi Skor Postingan')
+    plt.xlabel('Skor')
+    plt.ylabel('Frekuensi')
+    plt.xscale('symlog')
+    plt.yscale('log')
+    
+    # 2. Distribusi jumlah komentar
+    plt.subplot(2, 2, 2)
+    plt.bar(log_edges[:-1], agg['num_comments_hist'], width=log_widths, align='edge',
+            alpha=0.7, color='lightgreen', edgecolor='black')
+    plt.title('Distribusi Jumlah Komentar')
+    plt.xlabel('Jumlah Komentar')
+    plt.ylabel('Frekuensi')
+    plt.xscale('symlog')
+    plt.yscale('log')
+    
+    # 3. Skor vs komentar (histogram 2D)
+    plt.subplot(2, 2, 3)
+    counts = np.ma.masked_equal(np.array(agg['score_vs_comments_hist']).T, 0)
+    plt.pcolormesh(log_edges, log_edges, counts, cmap='Oranges')
+    plt.colorbar(label='Frekuensi')
+    plt.title('Skor vs Jumlah Komentar')
+    plt.xlabel('Skor')
+    plt.ylabel('Jumlah Komentar')
+    plt.xscale('symlog')
+    plt.yscale('symlog')
+    
+    # 4. Panjang judul vs skor (histogram 2D)
+    plt.subplot(2, 2, 4)
+    counts = np.ma.masked_equal(np.array(agg['title_length_vs_score_hist']).T, 0)
+    plt.pcolormesh(np.array(TITLE_LENGTH_BIN_EDGES), log_edges, counts, cmap='Purples')
+    plt.colorbar(label='Frekuensi')
+    plt.title('Panjang Judul vs Skor')
+    plt.xlabel('Panjang Judul (karakter)')
+    plt.ylabel('Skor')
+    plt.yscale('symlog')
+    
+    plt.tight_layout()
+    plt.savefig('data/plots/data_analysis.png', dpi=300, bbox_inches='tight')
+    print("💾 Visualisasi disimpan di: data/plots/data_analysis.png")
+    plt.show()
+
+def main_incremental():
+    """Eksplorasi inkremental: hanya partisi baru yang dibaca ulang"""
+    print("🔍 MEMULAI EKSPLORASI DATA (INKREMENTAL)")
+    print("="*50)
+    
+    agg = update_aggregates(CATEGORY_KEYWORDS)
+    if agg is None or agg['count'] == 0:
+        print("❌ Belum ada partisi data untuk dianalisis")
+        print("   Jalankan 'python get_data.py --bootstrap' untuk memasukkan data/reddit_posts.csv yang sudah ada")
+        return
+    
+    incremental_report(agg)
+    
+    try:
+        create_incremental_visualizations(agg)
+    except Exception as e:
+        print(f"⚠️ Error saat membuat visualisasi: {e}")
+    
+    print("\n✅ Eksplorasi data selesai!")
+    print("🔄 Langkah selanjutnya: Pelabelan manual data")
+
+def load_store_data():
+    """Memuat seluruh postingan dari store terindeks"""
+    if not store_exists():
+        print("❌ Store postingan tidak ditemukan")
+        print("   Jalankan get_data.py atau 'python post_store.py' terlebih dahulu")
+        return None
+    df = query_posts()
+    print("✅ Data berhasil dimuat dari store")
+    print(f"📊 Total baris: {len(df)}")
+    return df
+
+def main(incremental=False, use_store=False):
+    """
+    Fungsi utama
+    
+    Args:
+        incremental: Gunakan agregat partisi (hanya data baru yang dibaca)
+        use_store: Analisis seluruh postingan di store, bukan data/reddit_posts.csv
+    """
+    if incremental:
+        main_incremental()
+        return
+    
     print("🔍 MEMULAI EKSPLORASI DATA")
     print("="*50)
     
-    # Load data
-    df = load_data()
+    # Load data (seluruh laporan memakai satu sumber yang sama)
+    df = load_store_data() if use_store else load_data()
     if df is None:
         return
     
@@ -191,8 +345,11 @@ def main():
     # Analisis konten teks
     analyze_text_content(df)
     
-    # Tampilkan contoh postingan
-    show_sample_posts(df)
+    # Tampilkan contoh postingan (pakai indeks skor jika sumbernya store)
+    if use_store:
+        show_sample_posts(query_posts(order_by='score', limit=5))
+    else:
+        show_sample_posts(df)
     
     # Saran kategori
     suggest_categories(df)
@@ -207,4 +364,4 @@ def main():
     print("🔄 Langkah selanjutnya: Pelabelan manual data")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main(incremental='--incremental' in sys.argv, use_store='--store' in sys.argv) 
\ No newline at end of file
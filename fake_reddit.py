@@ -0,0 +1,198 @@
+"""
+Diabetes Insight Miner - Fake Reddit API
+Client Reddit palsu lokal untuk menjalankan get_comments.py tanpa akses jaringan.
+
+Hanya meniru bagian PRAW yang dipakai get_comments.py: reddit.submission(id=...),
+submission.num_comments, MoreComments.comments(), serta atribut dan replies
+setiap komentar. Menjalankan file ini akan mengeksekusi
+collect_comments terhadap thread palsu di database sementara dan memeriksa hasilnya.
+"""
+
+import copy
+import os
+import tempfile
+import threading
+import time
+
+from get_comments import collect_comments
+from post_store import COMMENT_MAX_ATTEMPTS, connect, posts_needing_comment_crawl, query_comments
+
+
+class FakeComment:
+    """Komentar dengan atribut yang sama seperti praw.models.Comment."""
+
+    def __init__(self, comment_id, parent_id, body, replies=None):
+        self.id = comment_id
+        self.parent_id = parent_id
+        self.author = f"user_{comment_id}"
+        self.body = body
+        self.score = 1
+        self.created_utc = 1700000000
+        self.replies = FakeCommentForest(replies or [])
+
+
+class FakeMoreComments:
+    """Pengganti praw.models.MoreComments: berisi komentar yang belum dimuat."""
+
+    # parent_id setiap MoreComments yang di-expand, untuk memeriksa request yang terbuang
+    expanded_parents = []
+    _lock = threading.Lock()
+
+    def __init__(self, more_id, parent_id, children):
+        self.id = more_id
+        self.parent_id = parent_id
+        self.children = children
+        self.count = len(children)
+
+    def comments(self, update=True):
+        """Memuat komentar tersembunyi (satu request API pada PRAW)."""
+        with self._lock:
+            self.expanded_parents.append(self.parent_id)
+        return list(self.children)
+
+
+class FakeCommentForest(list):
+    """List komentar yang dapat diiterasi seperti praw CommentForest."""
+
+
+class FakeSubmission:
+    """Postingan dengan comments dan num_comments seperti praw.models.Submission."""
+
+    def __init__(self, post_id, comments):
+        self.id = post_id
+        self.comments = FakeCommentForest(comments)
+        self.num_comments = count_comments(comments)
+
+
+class FakeReddit:
+    """
+    Client Reddit palsu.
+
+    Args:
+        threads: Dictionary post_id -> list komentar tingkat atas
+        latency: Jeda (detik) per pemanggilan submission() untuk meniru jaringan
+        failing_ids: ID postingan yang selalu menghasilkan error
+    """
+
+    def __init__(self, threads, latency=0.0, failing_ids=()):
+        self.threads = threads
+        self.latency = latency
+        self.failing_ids = set(failing_ids)
+
+    def submission(self, id):
+        if self.latency:
+            time.sleep(self.latency)
+        if id in self.failing_ids or id not in self.threads:
+            raise RuntimeError(f"received 404 HTTP response untuk {id}")
+        # Salinan baru per pemanggilan, seperti objek PRAW yang baru di-fetch
+        return FakeSubmission(id, copy.deepcopy(self.threads[id]))
+
+
+def count_comments(comments):
+    """Menghitung seluruh komentar (termasuk yang masih di dalam MoreComments)."""
+    total = 0
+    for item in comments:
+        if isinstance(item, FakeMoreComments):
+            total += count_comments(item.children)
+        else:
+            total += 1 + count_comments(item.replies)
+    return total
+
+
+def build_thread(post_id, top_level=3, depth=4, fanout=2, hidden=2):
+    """
+    Membuat pohon komentar palsu.
+
+    Setiap tingkat memiliki `fanout` balasan yang terlihat dan `hidden` balasan
+    tambahan di dalam FakeMoreComments.
+    """
+    def build(prefix, parent_id, level, width):
+        visible = []
+        for i in range(width):
+            comment_id = f"{prefix}_{i}"
+            replies = build(comment_id, f"t1_{comment_id}", level + 1, fanout) if level < depth else []
+            visible.append(FakeComment(comment_id, parent_id, f"komentar {comment_id}", replies))
+        if hidden and level < depth:
+            more = [
+                FakeComment(f"{prefix}_m{i}", parent_id, f"komentar tersembunyi {prefix}_m{i}")
+                for i in range(hidden)
+            ]
+            visible.append(FakeMoreComments(f"more_{prefix}", parent_id, more))
+        return visible
+
+    return build(post_id, f"t3_{post_id}", 0, top_level)
+
+
+def main():
+    """Menjalankan collect_comments terhadap API palsu dan memeriksa hasilnya."""
+    print("🧪 Menjalankan pengambilan komentar dengan Fake Reddit API...")
+    print("="*50)
+
+    threads = {f"post{i}": build_thread(f"post{i}") for i in range(20)}
+    num_comments = {post_id: count_comments(comments) for post_id, comments in threads.items()}
+    # post18 gagal sementara, post19 sudah dihapus dari Reddit (selalu 404)
+    reddit = FakeReddit(threads, latency=0.01, failing_ids={'post18'})
+    del threads['post19']
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = os.path.join(tmp_dir, 'posts.db')
+        conn = connect(db_path)
+        with conn:
+            conn.executemany(
+                "INSERT INTO posts (id, num_comments) VALUES (?, ?)",
+                list(num_comments.items())
+            )
+        conn.close()
+
+        # 1. Crawl pertama: semua thread kecuali yang gagal
+        post_ids = posts_needing_comment_crawl(db_path)
+        done, total, failed = collect_comments(
+            lambda: reddit, post_ids, db_path=db_path, max_depth=2, replace_more_limit=None, max_workers=4
+        )
+        print(f"📥 Crawl pertama: {done} thread, {total} komentar, gagal: {sorted(failed)}")
+        assert done == 18 and sorted(failed) == ['post18', 'post19']
+
+        comments = query_comments('post0', db_path=db_path)
+        assert len(comments) > 0 and comments['depth'].max() <= 2
+        assert comments['id'].str.contains('_m').any(), "MoreComments tidak di-expand"
+
+        # MoreComments hanya di-expand jika berada pada kedalaman <= max_depth,
+        # yaitu parent-nya postingan atau komentar dengan kedalaman < max_depth
+        all_comments = query_comments(db_path=db_path)
+        depths = dict(zip(all_comments['id'], all_comments['depth']))
+        for parent_id in FakeMoreComments.expanded_parents:
+            assert parent_id.startswith('t3_') or depths[parent_id[len('t1_'):]] < 2, parent_id
+        assert any(depths.get(p[len('t1_'):]) == 1 for p in FakeMoreComments.expanded_parents)
+
+        # 2. Tanpa perubahan: hanya thread yang gagal yang diambil ulang
+        assert sorted(posts_needing_comment_crawl(db_path)) == ['post18', 'post19']
+
+        # Thread yang terus gagal berhenti diantrekan setelah COMMENT_MAX_ATTEMPTS percobaan
+        reddit.failing_ids.clear()
+        for _ in range(COMMENT_MAX_ATTEMPTS - 1):
+            collect_comments(lambda: reddit, ['post19'], db_path=db_path, max_depth=2, max_workers=4)
+        assert posts_needing_comment_crawl(db_path) == ['post18']
+
+        # 3. Thread bertambah: hanya thread tersebut yang di-refresh
+        threads['post3'].append(FakeComment('post3_new', 't3_post3', 'komentar baru'))
+        conn = connect(db_path)
+        with conn:
+            conn.execute("UPDATE posts SET num_comments = num_comments + 1 WHERE id = 'post3'")
+            # Jumlah komentar turun (komentar dihapus) tidak boleh memicu crawl ulang terus-menerus
+            conn.execute("UPDATE posts SET num_comments = num_comments + 5 WHERE id = 'post4'")
+        conn.close()
+        threads['post4'] = threads['post4'][:1]
+
+        post_ids = posts_needing_comment_crawl(db_path)
+        print(f"🔄 Thread yang perlu di-refresh: {post_ids}")
+        assert sorted(post_ids) == ['post18', 'post3', 'post4']
+        collect_comments(lambda: reddit, post_ids, db_path=db_path, max_depth=2, max_workers=4)
+
+        assert 'post3_new' in set(query_comments('post3', db_path=db_path)['id'])
+        assert posts_needing_comment_crawl(db_path) == []
+
+    print("✅ Semua pemeriksaan Fake Reddit API lulus")
+
+
+if __name__ == "__main__":
+    main()
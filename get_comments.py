@@ -0,0 +1,231 @@
+"""
+Diabetes Insight Miner - Comment Collection Script
+Mengambil thread komentar dari postingan yang sudah tersimpan di store.
+
+MoreComments hanya di-expand sampai kedalaman maksimal (dibatasi limit), beberapa
+thread diproses bersamaan dengan jumlah worker terbatas, dan hanya postingan
+yang belum pernah di-crawl atau jumlah komentarnya bertambah yang diambil ulang.
+Thread yang gagal dicatat dan dilewati setelah COMMENT_MAX_ATTEMPTS percobaan.
+Lihat fake_reddit.py untuk menjalankan tahap ini dengan API palsu lokal.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+
+from get_data import setup_reddit_client
+from post_store import (
+    COMMENT_MAX_ATTEMPTS, DB_PATH, connect, posts_needing_comment_crawl, record_comment_crawl_failure,
+    replace_post_comments, store_exists
+)
+from reddit_config import CLIENT_ID, COMMENT_MAX_DEPTH, COMMENT_REPLACE_MORE_LIMIT, COMMENT_MAX_WORKERS
+
+
+def flatten_comment_tree(
+    post_id,
+    top_level_comments,
+    max_depth=COMMENT_MAX_DEPTH,
+    replace_more_limit=COMMENT_REPLACE_MORE_LIMIT
+):
+    """
+    Mengubah pohon komentar menjadi list datar hingga kedalaman tertentu.
+
+    Berbeda dengan replace_more, MoreComments hanya di-expand (satu request API
+    per MoreComments) jika berada pada kedalaman <= max_depth, sehingga tidak
+    ada request yang terbuang untuk komentar yang akhirnya dibuang.
+
+    Args:
+        post_id: ID postingan
+        top_level_comments: Komentar tingkat atas (submission.comments)
+        max_depth: Kedalaman maksimal (0 = hanya komentar tingkat atas)
+        replace_more_limit: Jumlah maksimal MoreComments yang di-expand (None = semua)
+
+    Returns:
+        List of dictionaries berisi data komentar
+    """
+    comments = []
+    seen = set()
+    # Kedalaman setiap item yang sudah masuk antrean, untuk menentukan kedalaman
+    # komentar hasil expand MoreComments berdasarkan parent_id
+    depths = {}
+    expanded = 0
+    queue = deque()
+
+    def enqueue(item, depth):
+        depths[item.id] = depth
+        queue.append((item, depth))
+
+    for comment in top_level_comments:
+        enqueue(comment, 0)
+
+    while queue:
+        comment, depth = queue.popleft()
+        if depth > max_depth:
+            continue
+
+        # MoreComments tidak punya body: expand menjadi komentar yang belum dimuat
+        if not hasattr(comment, 'body'):
+            if replace_more_limit is not None and expanded >= replace_more_limit:
+                continue
+            expanded += 1
+            for child in comment.comments():
+                parent = child.parent_id.split('_', 1)[-1]
+                enqueue(child, depths[parent] + 1 if parent in depths else depth)
+            continue
+
+        if comment.id in seen:
+            continue
+        seen.add(comment.id)
+
+        comments.append({
+            'post_id': post_id,
+            'id': comment.id,
+            'parent_id': comment.parent_id,
+            'depth': depth,
+            'author': str(comment.author) if comment.author else '[deleted]',
+            'body': comment.body,
+            'score': comment.score,
+            'created_utc': datetime.fromtimestamp(comment.created_utc).strftime('%Y-%m-%d %H:%M:%S'),
+        })
+
+        if depth < max_depth:
+            for reply in comment.replies:
+                enqueue(reply, depth + 1)
+
+    return comments
+
+
+def fetch_thread(reddit, post_id, max_depth=COMMENT_MAX_DEPTH, replace_more_limit=COMMENT_REPLACE_MORE_LIMIT):
+    """
+    Mengambil seluruh komentar satu postingan.
+
+    Args:
+        reddit: Reddit client instance
+        post_id: ID postingan
+        max_depth: Kedalaman maksimal thread
+        replace_more_limit: Jumlah maksimal MoreComments yang di-expand (None = semua)
+
+    Returns:
+        Tuple (list komentar, num_comments postingan saat ini)
+    """
+    submission = reddit.submission(id=post_id)
+    comments = flatten_comment_tree(
+        post_id, submission.comments, max_depth=max_depth, replace_more_limit=replace_more_limit
+    )
+    return comments, submission.num_comments
+
+
+def collect_comments(
+    reddit_factory,
+    post_ids,
+    db_path=DB_PATH,
+    max_depth=COMMENT_MAX_DEPTH,
+    replace_more_limit=COMMENT_REPLACE_MORE_LIMIT,
+    max_workers=COMMENT_MAX_WORKERS
+):
+    """
+    Mengambil komentar untuk banyak postingan dengan konkurensi terbatas.
+
+    Setiap worker memakai client Reddit sendiri dari reddit_factory, dan hanya
+    max_workers * 2 thread yang berada dalam antrean sekaligus. Hasil ditulis
+    ke store dari thread utama segera setelah tiap thread selesai. Thread yang
+    gagal dicatat di comment_crawls beserta jumlah percobaannya.
+
+    Args:
+        reddit_factory: Fungsi tanpa argumen yang mengembalikan Reddit client
+        post_ids: List ID postingan
+        db_path: Path file database SQLite
+        max_depth: Kedalaman maksimal thread
+        replace_more_limit: Jumlah maksimal MoreComments yang di-expand per thread
+        max_workers: Jumlah thread yang diproses bersamaan
+
+    Returns:
+        Tuple (jumlah thread berhasil, jumlah komentar, list ID yang gagal)
+    """
+    local = threading.local()
+
+    def worker(post_id):
+        if not hasattr(local, 'reddit'):
+            local.reddit = reddit_factory()
+        return fetch_thread(local.reddit, post_id, max_depth, replace_more_limit)
+
+    post_ids = iter(post_ids)
+    done_threads = 0
+    total_comments = 0
+    failed = []
+
+    conn = connect(db_path)
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            in_flight = {}
+            while True:
+                while len(in_flight) < max_workers * 2:
+                    post_id = next(post_ids, None)
+                    if post_id is None:
+                        break
+                    in_flight[executor.submit(worker, post_id)] = post_id
+                if not in_flight:
+                    break
+
+                finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    post_id = in_flight.pop(future)
+                    try:
+                        comments, num_comments = future.result()
+                    except Exception as e:
+                        print(f"⚠️ Error saat mengambil komentar postingan {post_id}: {e}")
+                        record_comment_crawl_failure(conn, post_id, str(e))
+                        failed.append(post_id)
+                        continue
+
+                    replace_post_comments(conn, post_id, comments, num_comments)
+                    done_threads += 1
+                    total_comments += len(comments)
+                    if done_threads % 100 == 0:
+                        print(f"📥 Telah mengambil {done_threads} thread ({total_comments} komentar)...")
+    finally:
+        conn.close()
+
+    return done_threads, total_comments, failed
+
+
+def main():
+    """Fungsi utama"""
+    print("🚀 Memulai pengambilan komentar dari Reddit...")
+    print("="*50)
+
+    if not store_exists():
+        print(f"❌ Store {DB_PATH} tidak ditemukan")
+        print("   Jalankan get_data.py terlebih dahulu")
+        return
+
+    # Cek apakah kredensial masih default
+    if CLIENT_ID == "YOUR_CLIENT_ID_HERE":
+        print("⚠️  PERINGATAN: Kredensial Reddit API masih default!")
+        print("   Silakan edit file 'reddit_config.py' dan masukkan kredensial Anda.")
+        print("   Kunjungi: https://www.reddit.com/prefs/apps")
+        return
+
+    post_ids = posts_needing_comment_crawl()
+    if not post_ids:
+        print("✅ Semua thread komentar sudah terbaru.")
+        return
+    print(f"📊 {len(post_ids)} thread baru atau bertambah akan diambil "
+          f"(kedalaman {COMMENT_MAX_DEPTH}, {COMMENT_MAX_WORKERS} worker)")
+
+    start = time.perf_counter()
+    done_threads, total_comments, failed = collect_comments(setup_reddit_client, post_ids)
+    elapsed = time.perf_counter() - start
+
+    print(f"✅ Berhasil mengambil {total_comments} komentar dari {done_threads} thread "
+          f"dalam {elapsed:.1f} detik")
+    if failed:
+        print(f"⚠️ {len(failed)} thread gagal; dicoba lagi pada run berikutnya "
+              f"hingga {COMMENT_MAX_ATTEMPTS} kali percobaan")
+    print(f"💾 Komentar tersimpan di tabel 'comments' pada {DB_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,8 @@ import pandas as pd
 import time
 from datetime import datetime
 import os
+import sys
+from post_store import DB_PATH, upsert_posts
 from reddit_config import CLIENT_ID, CLIENT_SECRET, USER_AGENT, SUBREDDIT_NAME, MAX_POSTS, TIME_FILTER
 
 def setup_reddit_client():
@@ -125,6 +127,66 @@ def save_to_csv(posts_data, filename='data/reddit_posts.csv'):
         print(f"❌ Error saat menyimpan data: {e}")
         return None
 
+def save_partition(posts_data, partition_dir='data/partitions'):
+    """
+    Menyimpan postingan baru sebagai partisi terpisah per pengambilan data
+    
+    Hanya postingan yang belum pernah tersimpan di partisi sebelumnya yang
+    ditulis, sehingga setiap partisi berisi data yang benar-benar baru.
+    
+    Args:
+        posts_data: List of dictionaries berisi data postingan
+        partition_dir: Direktori tempat partisi disimpan
+    
+    Returns:
+        Path file partisi, atau None jika tidak ada postingan baru
+    """
+    try:
+        os.makedirs(partition_dir, exist_ok=True)
+        seen_path = os.path.join(partition_dir, 'seen_ids.txt')
+        
+        seen_ids = set()
+        if os.path.exists(seen_path):
+            with open(seen_path, encoding='utf-8') as f:
+                seen_ids = {line.strip() for line in f if line.strip()}
+        
+        new_posts = [post for post in posts_data if post['id'] not in seen_ids]
+        if not new_posts:
+            print("ℹ️ Tidak ada postingan baru untuk partisi")
+            return None
+        
+        partition_name = datetime.now().strftime('posts_%Y%m%d_%H%M%S.csv')
+        partition_path = os.path.join(partition_dir, partition_name)
+        pd.DataFrame(new_posts).to_csv(partition_path, index=False, encoding='utf-8')
+        
+        with open(seen_path, 'a', encoding='utf-8') as f:
+            for post in new_posts:
+                f.write(f"{post['id']}\n")
+        
+        print(f"🗂️ {len(new_posts)} postingan baru disimpan di partisi {partition_path}")
+        return partition_path
+        
+    except Exception as e:
+        print(f"❌ Error saat menyimpan partisi: {e}")
+        return None
+
+def bootstrap_partitions(filename='data/reddit_posts.csv', partition_dir='data/partitions'):
+    """
+    Memasukkan data CSV yang sudah ada ke partisi (cukup dijalankan sekali)
+    
+    Args:
+        filename: File CSV hasil pengambilan data sebelumnya
+        partition_dir: Direktori tempat partisi disimpan
+    """
+    try:
+        df = pd.read_csv(filename)
+    except FileNotFoundError:
+        print(f"❌ File {filename} tidak ditemukan")
+        return None
+    
+    print(f"📂 Memasukkan {len(df)} postingan dari {filename} ke partisi")
+    return save_partition(df.to_dict('records'), partition_dir=partition_dir)
+
 def main():
     """Fungsi utama"""
     print("🚀 Memulai pengambilan data dari Reddit...")
@@ -158,10 +220,23 @@ def main():
     # Simpan data ke CSV
     df = save_to_csv(posts_data)
     
+    # Simpan postingan baru sebagai partisi untuk eksplorasi inkremental
+    save_partition(posts_data)
+    
+    # Simpan ke store terindeks untuk query cepat
+    try:
+        count = upsert_posts(posts_data)
+        print(f"🗄️ {count} postingan disimpan di store {DB_PATH}")
+    except Exception as e:
+        print(f"⚠️ Error saat menyimpan ke store: {e}")
+    
     if df is not None:
         print("\n✅ Pengambilan data selesai!")
         print("📁 File tersimpan di: data/reddit_posts.csv")
         print("🔄 Langkah selanjutnya: Pelabelan manual data")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    if '--bootstrap' in sys.argv:
+        bootstrap_partitions()
+    else:
+        main() 
\ No newline at end of file
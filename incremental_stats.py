@@ -0,0 +1,294 @@
+"""
+Diabetes Insight Miner - Incremental Statistics
+Agregat yang dapat digabung (mergeable) per partisi data untuk eksplorasi inkremental.
+
+Setiap partisi di data/partitions diringkas menjadi satu file JSON berisi
+jumlah, total, min/max, sketsa HyperLogLog author unik, hitungan kata kunci,
+dan bin histogram. Agregat kumulatif disimpan sebagai checkpoint, sehingga
+setiap run hanya membaca dan menggabungkan partisi baru.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+# --- Konfigurasi ---
+PARTITION_DIR = 'data/partitions'
+AGGREGATE_DIR = 'data/aggregates'
+HLL_PRECISION = 12
+TOP_POSTS = 5
+# Bin logaritmik (basis 2) untuk skor dan komentar, nilai negatif masuk bin pertama
+LOG_BIN_EDGES = [0] + [2 ** i for i in range(21)]
+# Bin linear untuk panjang judul (karakter)
+TITLE_LENGTH_BIN_EDGES = list(range(0, 310, 10))
+
+
+class HyperLogLog:
+    """Sketsa HyperLogLog sederhana untuk estimasi jumlah elemen unik."""
+
+    def __init__(self, precision=HLL_PRECISION, registers=None):
+        self.precision = precision
+        self.num_registers = 1 << precision
+        self.registers = list(registers) if registers is not None else [0] * self.num_registers
+
+    def add(self, value):
+        """Menambahkan satu elemen ke sketsa."""
+        digest = hashlib.sha1(str(value).encode('utf-8')).digest()
+        hashed = int.from_bytes(digest[:8], 'big')
+        index = hashed >> (64 - self.precision)
+        remaining = hashed & ((1 << (64 - self.precision)) - 1)
+        rank = (64 - self.precision) - remaining.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other):
+        """Menggabungkan sketsa lain (presisi harus sama)."""
+        if other.precision != self.precision:
+            raise ValueError("Presisi HyperLogLog tidak sama")
+        self.registers = [max(a, b) for a, b in zip(self.registers, other.registers)]
+        return self
+
+    def count(self):
+        """Estimasi jumlah elemen unik."""
+        m = self.num_registers
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros > 0:
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+def _log_histogram(values):
+    """Histogram dengan bin logaritmik tetap agar bisa dijumlahkan antar partisi."""
+    clipped = np.clip(values.fillna(0).to_numpy(dtype=float), 0, LOG_BIN_EDGES[-1])
+    counts, _ = np.histogram(clipped, bins=LOG_BIN_EDGES)
+    return counts.tolist()
+
+
+def compute_partition_aggregates(df, keywords):
+    """
+    Menghitung agregat yang dapat digabung untuk satu partisi.
+
+    Args:
+        df: DataFrame postingan satu partisi
+        keywords: Dictionary kategori -> list kata kunci
+
+    Returns:
+        Dictionary agregat
+    """
+    created = pd.to_datetime(df['created_utc'], errors='coerce').dropna()
+    has_body = df['body'].notna()
+    body = df.loc[has_body, 'body'].astype(str)
+    titles = df['title'].dropna().astype(str)
+
+    authors = HyperLogLog()
+    for author in df['author'].dropna():
+        authors.add(author)
+
+    title_text = ' '.join(titles).lower()
+    all_text = title_text + ' ' + ' '.join(body).lower()
+
+    clipped_score = np.clip(df['score'].fillna(0).to_numpy(dtype=float), 0, LOG_BIN_EDGES[-1])
+    clipped_comments = np.clip(df['num_comments'].fillna(0).to_numpy(dtype=float), 0, LOG_BIN_EDGES[-1])
+    score_vs_comments, _, _ = np.histogram2d(
+        clipped_score, clipped_comments, bins=[LOG_BIN_EDGES, LOG_BIN_EDGES]
+    )
+    title_lengths = df['title'].fillna('').astype(str).str.len().to_numpy(dtype=float)
+    clipped_title = np.clip(title_lengths, 0, TITLE_LENGTH_BIN_EDGES[-1])
+    title_length_vs_score, _, _ = np.histogram2d(
+        clipped_title, clipped_score, bins=[TITLE_LENGTH_BIN_EDGES, LOG_BIN_EDGES]
+    )
+
+    top_posts = df.nlargest(TOP_POSTS, 'score')[
+        ['title', 'score', 'num_comments', 'author', 'created_utc', 'body']
+    ]
+
+    return {
+        'count': int(len(df)),
+        'score_sum': float(df['score'].sum()),
+        'num_comments_sum': float(df['num_comments'].sum()),
+        'created_min': str(created.min()) if len(created) else None,
+        'created_max': str(created.max()) if len(created) else None,
+        'body_count': int(has_body.sum()),
+        'is_self_count': int(df['is_self'].sum()),
+        'title_count': int(len(titles)),
+        'title_length_sum': float(titles.str.len().sum()),
+        'title_words_sum': float(titles.str.split().str.len().sum()),
+        'body_length_sum': float(body.str.len().sum()),
+        'body_words_sum': float(body.str.split().str.len().sum()),
+        'author_hll': authors.registers,
+        'title_word_counts': dict(Counter(re.findall(r'\b\w+\b', title_text))),
+        'keyword_counts': {
+            category: sum(all_text.count(word) for word in words)
+            for category, words in keywords.items()
+        },
+        'score_hist': _log_histogram(df['score']),
+        'num_comments_hist': _log_histogram(df['num_comments']),
+        'score_vs_comments_hist': score_vs_comments.astype(int).tolist(),
+        'title_length_vs_score_hist': title_length_vs_score.astype(int).tolist(),
+        'top_posts': json.loads(top_posts.to_json(orient='records', date_format='iso')),
+    }
+
+
+SUM_KEYS = (
+    'count', 'score_sum', 'num_comments_sum', 'body_count', 'is_self_count',
+    'title_count', 'title_length_sum', 'title_words_sum', 'body_length_sum', 'body_words_sum'
+)
+COUNTER_KEYS = ('title_word_counts', 'keyword_counts')
+HIST_KEYS = ('score_hist', 'num_comments_hist', 'score_vs_comments_hist', 'title_length_vs_score_hist')
+
+
+def merge_aggregates(aggregates):
+    """
+    Menggabungkan beberapa agregat partisi menjadi satu.
+
+    Args:
+        aggregates: List dictionary agregat
+
+    Returns:
+        Dictionary agregat gabungan, atau None jika list kosong
+    """
+    if not aggregates:
+        return None
+
+    merged = {key: aggregates[0][key] for key in SUM_KEYS}
+    created_min = aggregates[0]['created_min']
+    created_max = aggregates[0]['created_max']
+    authors = HyperLogLog(registers=aggregates[0]['author_hll'])
+    counters = {key: Counter(aggregates[0][key]) for key in COUNTER_KEYS}
+    hists = {key: np.array(aggregates[0][key]) for key in HIST_KEYS}
+    top_posts = list(aggregates[0]['top_posts'])
+
+    for agg in aggregates[1:]:
+        for key in SUM_KEYS:
+            merged[key] += agg[key]
+        if agg['created_min'] and (created_min is None or agg['created_min'] < created_min):
+            created_min = agg['created_min']
+        if agg['created_max'] and (created_max is None or agg['created_max'] > created_max):
+            created_max = agg['created_max']
+        authors.merge(HyperLogLog(registers=agg['author_hll']))
+        for key in COUNTER_KEYS:
+            counters[key].update(agg[key])
+        for key in HIST_KEYS:
+            hists[key] += np.array(agg[key])
+        top_posts.extend(agg['top_posts'])
+
+    merged['created_min'] = created_min
+    merged['created_max'] = created_max
+    merged['author_hll'] = authors.registers
+    for key in COUNTER_KEYS:
+        merged[key] = dict(counters[key])
+    for key in HIST_KEYS:
+        merged[key] = hists[key].tolist()
+    merged['top_posts'] = sorted(top_posts, key=lambda p: p['score'], reverse=True)[:TOP_POSTS]
+    return merged
+
+
+def _read_json(path):
+    """Membaca file JSON; None jika tidak ada atau rusak (mis. run sebelumnya terputus)."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"⚠️ File {path} tidak dapat dibaca ({e}), akan dihitung ulang")
+        return None
+
+
+def _write_json_atomic(path, data):
+    """Menulis JSON ke file sementara lalu menggantinya secara atomik."""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def _partition_aggregates(partition_path, aggregate_path, signature, keywords):
+    """Memuat agregat partisi yang tersimpan, atau menghitungnya jika belum ada/berubah/rusak."""
+    stored = _read_json(aggregate_path)
+    if (isinstance(stored, dict) and 'aggregates' in stored
+            and stored.get('signature') == signature and stored.get('keywords') == keywords):
+        return stored['aggregates'], False
+
+    df = pd.read_csv(partition_path)
+    agg = compute_partition_aggregates(df, keywords)
+    _write_json_atomic(aggregate_path, {'signature': signature, 'keywords': keywords, 'aggregates': agg})
+    return agg, True
+
+
+def update_aggregates(keywords, partition_dir=PARTITION_DIR, aggregate_dir=AGGREGATE_DIR):
+    """
+    Menggabungkan partisi baru ke checkpoint agregat kumulatif.
+
+    Checkpoint (checkpoint.json) menyimpan agregat gabungan beserta daftar
+    partisi yang sudah tercakup. Pada kondisi normal (partisi hanya
+    bertambah) hanya partisi baru yang dibaca lalu digabungkan ke checkpoint.
+    Jika partisi lama berubah/terhapus atau kata kunci berubah, checkpoint
+    dibangun ulang dari agregat per partisi.
+
+    Args:
+        keywords: Dictionary kategori -> list kata kunci
+        partition_dir: Direktori partisi CSV
+        aggregate_dir: Direktori penyimpanan agregat JSON
+
+    Returns:
+        Dictionary agregat gabungan, atau None jika belum ada partisi
+    """
+    if not os.path.isdir(partition_dir):
+        print(f"❌ Direktori partisi {partition_dir} tidak ditemukan")
+        print("   Jalankan get_data.py atau 'python get_data.py --bootstrap' terlebih dahulu")
+        return None
+
+    os.makedirs(aggregate_dir, exist_ok=True)
+    checkpoint_path = os.path.join(aggregate_dir, 'checkpoint.json')
+
+    signatures = {}
+    for partition in sorted(f for f in os.listdir(partition_dir) if f.endswith('.csv')):
+        stat = os.stat(os.path.join(partition_dir, partition))
+        signatures[partition] = {'size': stat.st_size, 'mtime': stat.st_mtime}
+
+    checkpoint = _read_json(checkpoint_path)
+    if not isinstance(checkpoint, dict) or 'partitions' not in checkpoint or 'aggregates' not in checkpoint:
+        checkpoint = None
+    else:
+        covered = checkpoint['partitions']
+        if checkpoint.get('keywords') != keywords or any(
+            signatures.get(partition) != signature for partition, signature in covered.items()
+        ):
+            print("ℹ️ Partisi lama atau kata kunci berubah, checkpoint dibangun ulang")
+            checkpoint = None
+
+    covered = checkpoint['partitions'] if checkpoint else {}
+    pending = [partition for partition in signatures if partition not in covered]
+    if checkpoint is None and not pending:
+        return None
+
+    aggregates = [checkpoint['aggregates']] if checkpoint else []
+    computed = 0
+    for partition in pending:
+        agg, is_new = _partition_aggregates(
+            os.path.join(partition_dir, partition),
+            os.path.join(aggregate_dir, partition[:-len('.csv')] + '.json'),
+            signatures[partition],
+            keywords
+        )
+        aggregates.append(agg)
+        computed += is_new
+
+    merged = merge_aggregates(aggregates)
+    if pending:
+        covered = dict(covered)
+        covered.update({partition: signatures[partition] for partition in pending})
+        _write_json_atomic(checkpoint_path, {'partitions': covered, 'keywords': keywords, 'aggregates': merged})
+
+    print(f"✅ {len(signatures)} partisi tercakup ({len(pending)} digabungkan ke checkpoint, "
+          f"{computed} dibaca dari CSV)")
+    return merged
@@ -0,0 +1,321 @@
+"""
+Diabetes Insight Miner - Classifier Monitoring
+Memantau drift distribusi kelas dan throughput model yang sudah di-deploy.
+
+Semua statistik disimpan dalam jendela bergulir berukuran tetap (deque dengan
+maxlen dan total berjalan), sehingga memori tetap konstan berapa pun jumlah
+postingan yang di-scoring. Metrik dapat diekspor ke file JSON lokal atau
+sebagai teks format Prometheus lewat endpoint HTTP sederhana.
+"""
+
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# --- Konfigurasi ---
+TRAINING_DISTRIBUTION_PATH = os.path.join('models', 'training_distribution.json')
+# Setiap produsen metrik menulis file sendiri agar tidak saling menimpa
+APP_METRICS_PATH = 'data/metrics_app.json'
+BATCH_METRICS_PATH = 'data/metrics_batch.json'
+WINDOW_SIZE = 1000
+DRIFT_THRESHOLD = 0.2
+# Jumlah prediksi minimum dalam jendela sebelum drift dihitung
+MIN_DRIFT_SAMPLES = 100
+METRICS_PORT = 8000
+EPSILON = 1e-6
+
+
+class RollingWindow:
+    """Jendela bergulir berukuran tetap dengan total berjalan."""
+
+    def __init__(self, size=WINDOW_SIZE):
+        self.values = deque(maxlen=size)
+        self.total = 0.0
+
+    def add(self, value):
+        if len(self.values) == self.values.maxlen:
+            self.total -= self.values[0]
+        self.values.append(value)
+        self.total += value
+
+    def __len__(self):
+        return len(self.values)
+
+    def mean(self):
+        return self.total / len(self.values) if self.values else 0.0
+
+
+def save_training_distribution(labels, path=TRAINING_DISTRIBUTION_PATH):
+    """
+    Menyimpan proporsi kelas data latih sebagai acuan drift.
+
+    Args:
+        labels: Iterable label kelas data latih
+        path: Path file JSON output
+    """
+    counts = Counter(labels)
+    total = sum(counts.values())
+    distribution = {label: count / total for label, count in sorted(counts.items())}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(distribution, f, indent=2)
+    print(f"💾 Distribusi kelas data latih disimpan di: {path}")
+    return distribution
+
+
+def load_training_distribution(path=TRAINING_DISTRIBUTION_PATH):
+    """Memuat proporsi kelas data latih, atau None jika belum ada."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def population_stability_index(expected, actual):
+    """
+    Menghitung Population Stability Index (PSI) antara dua distribusi.
+
+    Args:
+        expected: Dictionary label -> proporsi acuan
+        actual: Dictionary label -> proporsi observasi
+
+    Returns:
+        Nilai PSI (>= 0.2 umumnya dianggap drift yang signifikan)
+    """
+    psi = 0.0
+    for label in set(expected) | set(actual):
+        e = max(expected.get(label, 0.0), EPSILON)
+        a = max(actual.get(label, 0.0), EPSILON)
+        psi += (a - e) * math.log(a / e)
+    return psi
+
+
+class ClassifierMonitor:
+    """
+    Mengakumulasi statistik prediksi dan latensi dalam jendela bergulir.
+
+    Args:
+        vocabulary: vectorizer.vocabulary_ untuk menghitung laju token OOV
+        analyzer: vectorizer.build_analyzer() agar tokenisasi OOV sama dengan vectorizer
+        training_distribution: Dictionary label -> proporsi data latih
+        window_size: Jumlah observasi terakhir yang disimpan per metrik
+        drift_threshold: Batas PSI untuk menandai drift
+        min_samples: Jumlah prediksi minimum sebelum drift dihitung
+    """
+
+    def __init__(self, vocabulary=None, analyzer=None, training_distribution=None,
+                 window_size=WINDOW_SIZE, drift_threshold=DRIFT_THRESHOLD,
+                 min_samples=MIN_DRIFT_SAMPLES):
+        self.vocabulary = vocabulary or {}
+        self.analyzer = analyzer
+        self.training_distribution = training_distribution or {}
+        self.window_size = window_size
+        self.drift_threshold = drift_threshold
+        self.min_samples = min(min_samples, window_size)
+
+        self.predictions = deque(maxlen=window_size)
+        self.prediction_counts = Counter()
+        self.confidence = RollingWindow(window_size)
+        self.oov_tokens = RollingWindow(window_size)
+        self.total_tokens = RollingWindow(window_size)
+        self.stage_seconds = {}
+        self.stage_items = {}
+        self.total_predictions = 0
+        self._lock = threading.Lock()
+
+    def observe(self, predictions, probabilities=None, processed_texts=None):
+        """
+        Mencatat hasil prediksi satu batch.
+
+        Args:
+            predictions: Label hasil model.predict
+            probabilities: Hasil model.predict_proba (opsional)
+            processed_texts: Teks setelah preprocessing (opsional, untuk laju OOV)
+        """
+        with self._lock:
+            for label in predictions:
+                if len(self.predictions) == self.predictions.maxlen:
+                    oldest = self.predictions[0]
+                    self.prediction_counts[oldest] -= 1
+                    if self.prediction_counts[oldest] <= 0:
+                        del self.prediction_counts[oldest]
+                self.predictions.append(label)
+                self.prediction_counts[label] += 1
+                self.total_predictions += 1
+
+            if probabilities is not None:
+                for row in probabilities:
+                    self.confidence.add(float(max(row)))
+
+            if processed_texts is not None:
+                for text in processed_texts:
+                    tokens = self._unigrams(text)
+                    self.total_tokens.add(len(tokens))
+                    self.oov_tokens.add(sum(1 for token in tokens if token not in self.vocabulary))
+
+    def _unigrams(self, text):
+        """Token unigram dengan tokenisasi yang sama seperti vectorizer (jika tersedia)."""
+        if self.analyzer is None:
+            return text.split()
+        # Analyzer dengan ngram_range > 1 juga menghasilkan n-gram yang dipisah spasi
+        return [token for token in self.analyzer(text) if ' ' not in token]
+
+    def record_timing(self, stage, seconds, n_items=1):
+        """Mencatat durasi satu tahap (mis. 'preprocess', 'inference') untuk n_items postingan."""
+        with self._lock:
+            if stage not in self.stage_seconds:
+                self.stage_seconds[stage] = RollingWindow(self.window_size)
+                self.stage_items[stage] = RollingWindow(self.window_size)
+            self.stage_seconds[stage].add(seconds)
+            self.stage_items[stage].add(n_items)
+
+    @contextmanager
+    def timed(self, stage, n_items=1):
+        """Context manager untuk mengukur durasi satu tahap."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_timing(stage, time.perf_counter() - start, n_items)
+
+    def class_distribution(self):
+        """Proporsi kelas prediksi dalam jendela saat ini."""
+        total = len(self.predictions)
+        if total == 0:
+            return {}
+        return {label: count / total for label, count in sorted(self.prediction_counts.items())}
+
+    def snapshot(self):
+        """
+        Mengambil ringkasan metrik saat ini.
+
+        Returns:
+            Dictionary berisi distribusi kelas, drift, confidence, OOV, dan latensi
+        """
+        with self._lock:
+            distribution = self.class_distribution()
+            drift = (
+                population_stability_index(self.training_distribution, distribution)
+                if self.training_distribution and distribution
+                and len(self.predictions) >= self.min_samples else None
+            )
+            stages = {}
+            for stage, seconds in self.stage_seconds.items():
+                items = self.stage_items[stage].total
+                stages[stage] = {
+                    'seconds_per_item': seconds.total / items if items else 0.0,
+                    'items_per_second': items / seconds.total if seconds.total else 0.0,
+                }
+            return {
+                'timestamp': time.time(),
+                'window_size': len(self.predictions),
+                'total_predictions': self.total_predictions,
+                'class_distribution': distribution,
+                'training_distribution': self.training_distribution,
+                'drift_psi': drift,
+                'drift_detected': drift is not None and drift >= self.drift_threshold,
+                'mean_confidence': self.confidence.mean(),
+                'oov_rate': self.oov_tokens.total / self.total_tokens.total if self.total_tokens.total else 0.0,
+                'stages': stages,
+            }
+
+    def write_metrics(self, path):
+        """Menyimpan snapshot metrik ke file JSON lokal (APP_METRICS_PATH atau BATCH_METRICS_PATH)."""
+        snapshot = self.snapshot()
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        # File sementara unik per pemanggil agar penulisan bersamaan tidak saling tumpang tindih
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory,
+                                         suffix='.tmp', delete=False) as f:
+            json.dump(snapshot, f, indent=2)
+        os.replace(f.name, path)
+        return snapshot
+
+    def prometheus_text(self):
+        """Merender metrik dalam format teks Prometheus."""
+        snapshot = self.snapshot()
+        lines = [
+            '# HELP diabetes_classifier_predictions_total Jumlah prediksi sejak start.',
+            '# TYPE diabetes_classifier_predictions_total counter',
+            f"diabetes_classifier_predictions_total {snapshot['total_predictions']}",
+            '# HELP diabetes_classifier_class_share Proporsi kelas prediksi dalam jendela.',
+            '# TYPE diabetes_classifier_class_share gauge',
+        ]
+        for label, share in snapshot['class_distribution'].items():
+            escaped = str(label).replace('\\', '\\\\').replace('"', '\\"')
+            lines.append(f'diabetes_classifier_class_share{{category="{escaped}"}} {share}')
+        if snapshot['drift_psi'] is not None:
+            lines += [
+                '# HELP diabetes_classifier_drift_psi PSI distribusi prediksi terhadap data latih.',
+                '# TYPE diabetes_classifier_drift_psi gauge',
+                f"diabetes_classifier_drift_psi {snapshot['drift_psi']}",
+            ]
+        lines += [
+            '# HELP diabetes_classifier_mean_confidence Rata-rata probabilitas kelas teratas.',
+            '# TYPE diabetes_classifier_mean_confidence gauge',
+            f"diabetes_classifier_mean_confidence {snapshot['mean_confidence']}",
+            '# HELP diabetes_classifier_oov_rate Laju token di luar vocabulary vectorizer.',
+            '# TYPE diabetes_classifier_oov_rate gauge',
+            f"diabetes_classifier_oov_rate {snapshot['oov_rate']}",
+            '# HELP diabetes_classifier_stage_seconds_per_item Latensi rata-rata per postingan.',
+            '# TYPE diabetes_classifier_stage_seconds_per_item gauge',
+        ]
+        for stage, stats in snapshot['stages'].items():
+            lines.append(
+                f'diabetes_classifier_stage_seconds_per_item{{stage="{stage}"}} {stats["seconds_per_item"]}'
+            )
+        return '\n'.join(lines) + '\n'
+
+    def serve_metrics(self, port=METRICS_PORT):
+        """
+        Menjalankan endpoint HTTP /metrics di thread latar belakang.
+
+        Returns:
+            Instance HTTPServer (panggil shutdown() untuk menghentikan)
+        """
+        monitor = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = monitor.prometheus_text().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = HTTPServer(('', port), MetricsHandler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"📡 Endpoint metrik tersedia di http://localhost:{port}/metrics")
+        return server
+
+    def print_report(self):
+        """Menampilkan ringkasan metrik ke konsol."""
+        snapshot = self.snapshot()
+        print("\n" + "="*50)
+        print("📡 MONITORING KLASIFIKASI")
+        print("="*50)
+        print(f"📊 Prediksi dalam jendela: {snapshot['window_size']} (total {snapshot['total_predictions']})")
+        print(f"🎯 Rata-rata confidence: {snapshot['mean_confidence']:.2%}")
+        print(f"🔤 Laju token OOV: {snapshot['oov_rate']:.2%}")
+        if snapshot['drift_psi'] is not None:
+            status = "⚠️ DRIFT TERDETEKSI - pertimbangkan retraining" if snapshot['drift_detected'] else "✅ stabil"
+            print(f"📉 Drift (PSI): {snapshot['drift_psi']:.3f} {status}")
+        elif self.training_distribution:
+            print(f"📉 Drift (PSI): menunggu minimal {self.min_samples} prediksi")
+        for stage, stats in snapshot['stages'].items():
+            print(f"⏱️ {stage}: {stats['seconds_per_item']*1000:.2f} ms/postingan "
+                  f"({stats['items_per_second']:.1f} postingan/detik)")
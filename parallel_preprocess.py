@@ -0,0 +1,310 @@
+"""
+Diabetes Insight Miner - Sharded Preprocessing Pipeline
+Memproses teks dengan spaCy secara paralel di beberapa proses worker.
+
+Korpus dibagi menjadi shard, setiap worker memuat pipeline spaCy satu kali,
+dan hasil tiap shard dikirim kembali lewat shared memory (bukan pickle list
+string yang besar) sesuai urutan aslinya.
+"""
+
+import math
+import os
+import re
+import secrets
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import resource_tracker, shared_memory
+
+import pandas as pd
+
+# --- Konfigurasi ---
+SPACY_MODEL = "en_core_web_sm"
+# Ukuran shard maksimal; shard diperkecil agar setiap worker mendapat beberapa shard
+SHARD_SIZE = 500
+SHARDS_PER_WORKER = 3
+BATCH_SIZE = 64
+MAX_RETRIES = 2
+# Parser dan NER tidak dipakai untuk lemmatisasi/stopword, jadi dimatikan
+DISABLED_PIPES = ["parser", "ner"]
+
+# Pipeline spaCy milik proses worker (dimuat sekali oleh _init_worker)
+_nlp = None
+
+
+def ensure_spacy_model(model_name=SPACY_MODEL):
+    """Mengunduh model spaCy sekali di proses induk jika belum terpasang."""
+    import spacy
+    if not spacy.util.is_package(model_name):
+        print(f"Model '{model_name}' tidak ditemukan. Mengunduh...")
+        os.system(f"python -m spacy download {model_name}")
+
+
+def _init_worker(model_name):
+    """Memuat pipeline spaCy satu kali per proses worker."""
+    global _nlp
+    import spacy
+    _nlp = spacy.load(model_name, disable=DISABLED_PIPES)
+
+
+def _clean_doc(doc):
+    """Lemmatisasi dan hapus stopwords/tanda baca (sama dengan app.py)."""
+    tokens = [
+        token.lemma_.lower().strip()
+        for token in doc
+        if not token.is_stop and not token.is_punct and len(token.lemma_.strip()) > 2
+    ]
+    return " ".join(tokens)
+
+
+def _process_shard(shard_index, texts, batch_size, shm_name):
+    """
+    Memproses satu shard dan menulis hasilnya ke blok shared memory.
+
+    Nama blok ditentukan oleh proses induk, sehingga blok tetap bisa dibebaskan
+    walaupun worker mati setelah membuatnya tetapi sebelum sempat mengembalikan hasil.
+
+    Returns:
+        Tuple (shard_index, nama shared memory, panjang byte tiap teks, error)
+    """
+    try:
+        cleaned = [
+            re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
+            if isinstance(text, str) else ""
+            for text in texts
+        ]
+        processed = [_clean_doc(doc) for doc in _nlp.pipe(cleaned, batch_size=batch_size)]
+
+        encoded = [text.encode('utf-8') for text in processed]
+        lengths = [len(chunk) for chunk in encoded]
+        blob = b"".join(encoded)
+
+        shm = shared_memory.SharedMemory(name=shm_name, create=True, size=max(len(blob), 1))
+        shm.buf[:len(blob)] = blob
+        name = shm.name
+        shm.close()
+        # Blok dibebaskan oleh proses induk setelah dibaca, bukan oleh worker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+        return shard_index, name, lengths, None
+    except Exception as e:
+        return shard_index, None, None, f"{type(e).__name__}: {e}"
+
+
+def _read_shard(name, lengths):
+    """Membaca hasil shard dari shared memory lalu membebaskan bloknya."""
+    shm = shared_memory.SharedMemory(name=name)
+    try:
+        blob = bytes(shm.buf[:sum(lengths)])
+    finally:
+        shm.close()
+        shm.unlink()
+
+    texts = []
+    offset = 0
+    for length in lengths:
+        texts.append(blob[offset:offset + length].decode('utf-8'))
+        offset += length
+    return texts
+
+
+def _unlink_shard(name):
+    """Membebaskan blok shared memory yang tidak akan dibaca."""
+    try:
+        shm = shared_memory.SharedMemory(name=name)
+    except FileNotFoundError:
+        return
+    shm.close()
+    shm.unlink()
+
+
+def plan_shards(n_texts, n_workers=None, shard_size=None):
+    """
+    Menentukan jumlah worker efektif dan ukuran shard untuk sejumlah teks.
+
+    Args:
+        n_texts: Jumlah teks
+        n_workers: Jumlah worker yang diminta (default: jumlah CPU)
+        shard_size: Ukuran shard tetap (default: otomatis, sekitar
+            SHARDS_PER_WORKER shard per worker dan maksimal SHARD_SIZE)
+
+    Returns:
+        Tuple (jumlah worker yang benar-benar dipakai, ukuran shard)
+    """
+    n_workers = n_workers or os.cpu_count() or 1
+    if shard_size is None:
+        shard_size = min(SHARD_SIZE, math.ceil(n_texts / (n_workers * SHARDS_PER_WORKER)))
+    shard_size = max(shard_size, 1)
+    n_shards = math.ceil(n_texts / shard_size)
+    # Tidak perlu worker lebih banyak dari jumlah shard (tiap worker memuat spaCy)
+    return max(min(n_workers, n_shards), 1), shard_size
+
+
+def iter_preprocessed_shards(
+    texts,
+    n_workers=None,
+    shard_size=None,
+    batch_size=BATCH_SIZE,
+    max_retries=MAX_RETRIES,
+    model_name=SPACY_MODEL
+):
+    """
+    Memproses teks per shard secara paralel dan menghasilkan shard sesuai urutan.
+
+    Args:
+        texts: List teks mentah
+        n_workers: Jumlah proses worker (default: jumlah CPU, maksimal jumlah shard)
+        shard_size: Jumlah teks per shard (default: otomatis, lihat plan_shards)
+        batch_size: Ukuran batch untuk nlp.pipe di dalam worker
+        max_retries: Jumlah percobaan ulang untuk shard yang gagal, termasuk
+            shard yang hilang karena proses worker mati
+        model_name: Nama model spaCy
+
+    Yields:
+        List teks yang sudah diproses untuk setiap shard, berurutan
+    """
+    texts = list(texts)
+    if not texts:
+        return
+    n_workers, shard_size = plan_shards(len(texts), n_workers, shard_size)
+    shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+
+    def new_executor():
+        return ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_worker, initargs=(model_name,)
+        )
+
+    executor = new_executor()
+    # Semua nama blok yang pernah dibagikan, untuk dibersihkan di akhir
+    shm_names = []
+
+    def submit(i):
+        name = f"dim_{os.getpid()}_{secrets.token_hex(6)}"
+        shm_names.append(name)
+        return executor.submit(_process_shard, i, shards[i], batch_size, name)
+
+    futures = [submit(i) for i in range(len(shards))]
+    attempts = [0] * len(shards)
+
+    def retry(i, error):
+        if attempts[i] >= max_retries:
+            raise RuntimeError(f"Shard {i} gagal setelah {max_retries} percobaan ulang: {error}")
+        attempts[i] += 1
+        print(f"⚠️ Shard {i} gagal ({error}), mencoba ulang ({attempts[i]}/{max_retries})...")
+        futures[i] = submit(i)
+
+    next_index = 0
+    try:
+        while next_index < len(shards):
+            i = next_index
+            try:
+                _, name, lengths, error = futures[i].result()
+            except BrokenProcessPool as e:
+                # Worker mati (OOM, crash native): bangun ulang pool lalu kirim ulang
+                # setiap shard yang hilang bersama pool lama
+                executor.shutdown(wait=True, cancel_futures=True)
+                executor = new_executor()
+                for j in range(i, len(shards)):
+                    if futures[j].cancelled() or futures[j].exception() is not None:
+                        retry(j, f"worker berhenti: {e}")
+                continue
+
+            if error is not None:
+                retry(i, error)
+                continue
+
+            next_index += 1
+            yield _read_shard(name, lengths)
+    finally:
+        # Bebaskan shared memory yang belum sempat dibaca, termasuk blok milik
+        # worker yang mati (blok yang sudah dibaca dilewati oleh _unlink_shard)
+        executor.shutdown(wait=True, cancel_futures=True)
+        for name in shm_names:
+            _unlink_shard(name)
+
+
+def preprocess_parallel(texts, n_workers=None, **kwargs):
+    """
+    Memproses seluruh teks secara paralel.
+
+    Args:
+        texts: List teks mentah
+        n_workers: Jumlah proses worker (default: jumlah CPU)
+        **kwargs: Diteruskan ke iter_preprocessed_shards
+
+    Returns:
+        List teks yang sudah diproses, urutannya sama dengan input
+    """
+    processed = []
+    for shard in iter_preprocessed_shards(texts, n_workers=n_workers, **kwargs):
+        processed.extend(shard)
+    return processed
+
+
+def report_scaling(texts, worker_counts=None, **kwargs):
+    """
+    Mengukur efisiensi scaling dari 1 hingga N core.
+
+    Args:
+        texts: List teks mentah
+        worker_counts: List jumlah worker yang diuji (default: 1, 2, 4, ... hingga jumlah CPU)
+        **kwargs: Diteruskan ke iter_preprocessed_shards
+
+    Returns:
+        DataFrame berisi waktu, throughput, speedup, dan efisiensi per jumlah worker
+    """
+    if worker_counts is None:
+        max_workers = os.cpu_count() or 1
+        worker_counts = []
+        n = 1
+        while n < max_workers:
+            worker_counts.append(n)
+            n *= 2
+        worker_counts.append(max_workers)
+
+    texts = list(texts)
+    rows = []
+    for n_workers in worker_counts:
+        # Catat jumlah worker yang benar-benar dipakai, bukan yang diminta
+        effective_workers, _ = plan_shards(len(texts), n_workers, kwargs.get('shard_size'))
+        start = time.perf_counter()
+        preprocess_parallel(texts, n_workers=n_workers, **kwargs)
+        elapsed = time.perf_counter() - start
+        rows.append({
+            'requested_workers': n_workers,
+            'workers': effective_workers,
+            'seconds': elapsed,
+            'docs_per_sec': len(texts) / elapsed if elapsed > 0 else float('inf')
+        })
+
+    report = pd.DataFrame(rows)
+    baseline = report['seconds'].iloc[0] * report['workers'].iloc[0]
+    report['speedup'] = baseline / report['seconds']
+    report['efficiency'] = report['speedup'] / report['workers']
+
+    print("\n" + "="*50)
+    print("⚡ EFISIENSI SCALING PREPROCESSING")
+    print("="*50)
+    for _, row in report.iterrows():
+        print(
+            f"   {int(row['workers']):3d} worker: {row['seconds']:8.2f} detik | "
+            f"{row['docs_per_sec']:8.1f} dok/detik | speedup {row['speedup']:5.2f}x | "
+            f"efisiensi {row['efficiency']:.0%}"
+        )
+    return report
+
+
+def main(input_filename='data/reddit_posts.csv'):
+    """Fungsi utama: benchmark scaling pada seluruh postingan yang dikumpulkan."""
+    try:
+        df = pd.read_csv(input_filename)
+        print(f"✅ Berhasil memuat {len(df)} data dari {input_filename}")
+    except FileNotFoundError:
+        print(f"❌ File tidak ditemukan: {input_filename}")
+        return
+
+    texts = (df['title'].fillna('') + ' ' + df['body'].fillna('')).tolist()
+    report_scaling(texts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+Diabetes Insight Miner - Indexed Post Store
+Penyimpanan postingan lokal berbasis SQLite dengan indeks untuk query cepat.
+
+Postingan disimpan dengan kolom bantu created_month (YYYY-MM) dan body_length
+sehingga filter rentang waktu, subreddit, skor, jumlah komentar, dan panjang
+body dapat dijawab lewat indeks tanpa memuat seluruh data. Komentar hasil
+get_comments.py disimpan di tabel terpisah yang dikelompokkan per post_id.
+"""
+
+import os
+import sqlite3
+
+import pandas as pd
+
+# --- Konfigurasi ---
+DB_PATH = 'data/posts.db'
+
+POST_COLUMNS = [
+    'id', 'title', 'body', 'score', 'upvote_ratio', 'num_comments', 'created_utc',
+    'author', 'url', 'permalink', 'is_self', 'over_18', 'spoiler', 'stickied', 'subreddit'
+]
+SORTABLE_COLUMNS = ['id', 'score', 'num_comments', 'body_length', 'created_utc']
+COMMENT_COLUMNS = ['post_id', 'id', 'parent_id', 'depth', 'author', 'body', 'score', 'created_utc']
+# Thread yang gagal sebanyak ini (mis. 404/dihapus) tidak diantrekan lagi
+COMMENT_MAX_ATTEMPTS = 3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS posts (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    body TEXT,
+    score INTEGER,
+    upvote_ratio REAL,
+    num_comments INTEGER,
+    created_utc TEXT,
+    author TEXT,
+    url TEXT,
+    permalink TEXT,
+    is_self INTEGER,
+    over_18 INTEGER,
+    spoiler INTEGER,
+    stickied INTEGER,
+    subreddit TEXT,
+    created_month TEXT,
+    body_length INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_posts_month_subreddit ON posts (created_month, subreddit);
+CREATE INDEX IF NOT EXISTS idx_posts_month_score ON posts (created_month, score);
+CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_utc);
+CREATE INDEX IF NOT EXISTS idx_posts_score ON posts (score);
+CREATE INDEX IF NOT EXISTS idx_posts_num_comments ON posts (num_comments);
+CREATE INDEX IF NOT EXISTS idx_posts_body_length ON posts (body_length);
+
+-- Komentar dikelompokkan per post_id (primary key WITHOUT ROWID menyimpan
+-- baris secara fisik berurutan berdasarkan post_id)
+CREATE TABLE IF NOT EXISTS comments (
+    post_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    parent_id TEXT,
+    depth INTEGER,
+    author TEXT,
+    body TEXT,
+    score INTEGER,
+    created_utc TEXT,
+    PRIMARY KEY (post_id, id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS comment_crawls (
+    post_id TEXT PRIMARY KEY,
+    num_comments INTEGER,
+    crawled_at TEXT,
+    failed_attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+"""
+
+# Kolom yang ditambahkan setelah tabel dibuat, untuk store lama
+MIGRATIONS = {
+    'comment_crawls': {
+        'failed_attempts': 'INTEGER NOT NULL DEFAULT 0',
+        'last_error': 'TEXT',
+    },
+}
+
+
+def connect(db_path=DB_PATH):
+    """Membuka koneksi ke store dan membuat tabel/indeks jika belum ada."""
+    os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    for table, columns in MIGRATIONS.items():
+        existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+        for column, definition in columns.items():
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    return conn
+
+
+def upsert_posts(posts, db_path=DB_PATH):
+    """
+    Menyimpan atau memperbarui postingan di store.
+
+    Args:
+        posts: DataFrame atau list of dictionaries berisi data postingan
+        db_path: Path file database SQLite
+
+    Returns:
+        Jumlah postingan yang ditulis
+    """
+    df = pd.DataFrame(posts)
+    if df.empty:
+        return 0
+
+    df = df.reindex(columns=POST_COLUMNS)
+    created = pd.to_datetime(df['created_utc'], errors='coerce')
+    df['created_utc'] = created.dt.strftime('%Y-%m-%d %H:%M:%S')
+    df['created_month'] = created.dt.strftime('%Y-%m')
+    df['body_length'] = df['body'].astype('string').str.len().fillna(0).astype(int)
+    for column in ['is_self', 'over_18', 'spoiler', 'stickied']:
+        df[column] = df[column].astype('boolean').astype('Int64')
+
+    columns = POST_COLUMNS + ['created_month', 'body_length']
+    rows = df[columns].astype(object).where(df[columns].notna(), None).values.tolist()
+    updates = ', '.join(f"{c} = excluded.{c}" for c in columns if c != 'id')
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany(
+                f"INSERT INTO posts ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT(id) DO UPDATE SET {updates}",
+                rows
+            )
+    finally:
+        conn.close()
+    return len(rows)
+
+
+def import_csv(csv_path='data/reddit_posts.csv', db_path=DB_PATH):
+    """Mengimpor file CSV hasil get_data.py ke dalam store."""
+    df = pd.read_csv(csv_path)
+    count = upsert_posts(df, db_path=db_path)
+    print(f"💾 {count} postingan dari {csv_path} disimpan di {db_path}")
+    return count
+
+
+def query_posts(
+    db_path=DB_PATH,
+    columns=None,
+    month=None,
+    start=None,
+    end=None,
+    subreddit=None,
+    min_score=None,
+    min_num_comments=None,
+    min_body_length=None,
+    order_by=None,
+    ascending=False,
+    limit=None
+):
+    """
+    Mengambil postingan dari store dengan filter yang didukung indeks.
+
+    Contoh: top 10 berdasarkan skor di Maret 2025 dengan body > 20 karakter
+        query_posts(month='2025-03', min_body_length=21, order_by='score', limit=10)
+
+    Args:
+        db_path: Path file database SQLite
+        columns: List kolom yang diambil (default: semua kolom postingan)
+        month: Bulan 'YYYY-MM'
+        start: Batas bawah created_utc (inklusif), mis. '2025-03-01'
+        end: Batas atas created_utc (eksklusif), mis. '2025-04-01'
+        subreddit: Nama subreddit
+        min_score: Skor minimum
+        min_num_comments: Jumlah komentar minimum
+        min_body_length: Panjang body minimum (karakter)
+        order_by: Kolom pengurutan (id, score, num_comments, body_length, created_utc)
+        ascending: Urutan menaik jika True
+        limit: Jumlah maksimal baris
+
+    Returns:
+        DataFrame berisi postingan yang cocok
+    """
+    columns = columns or POST_COLUMNS
+    unknown = set(columns) - set(POST_COLUMNS + ['created_month', 'body_length'])
+    if unknown:
+        raise ValueError(f"Kolom tidak dikenal: {sorted(unknown)}")
+
+    conditions = []
+    params = []
+    filters = [
+        ('created_month = ?', month),
+        ('created_utc >= ?', start),
+        ('created_utc < ?', end),
+        ('subreddit = ?', subreddit),
+        ('score >= ?', min_score),
+        ('num_comments >= ?', min_num_comments),
+        ('body_length >= ?', min_body_length),
+    ]
+    for condition, value in filters:
+        if value is not None:
+            conditions.append(condition)
+            params.append(value)
+
+    sql = f"SELECT {', '.join(columns)} FROM posts"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+    if order_by is not None:
+        if order_by not in SORTABLE_COLUMNS:
+            raise ValueError(f"Kolom pengurutan tidak didukung: {order_by}")
+        sql += f" ORDER BY {order_by} {'ASC' if ascending else 'DESC'}"
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+
+    conn = connect(db_path)
+    try:
+        df = pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+    for column in ['is_self', 'over_18', 'spoiler', 'stickied']:
+        if column in df.columns:
+            df[column] = df[column].astype('boolean')
+    return df
+
+
+def replace_post_comments(conn, post_id, comments, num_comments):
+    """
+    Mengganti seluruh komentar satu postingan dan mencatat status crawl-nya.
+
+    Args:
+        conn: Koneksi dari connect()
+        post_id: ID postingan
+        comments: List of dictionaries berisi data komentar
+        num_comments: Jumlah komentar postingan saat di-crawl
+
+    Yang dicatat adalah nilai terbesar antara num_comments live dan nilai di
+    tabel posts, supaya thread tidak di-crawl ulang terus-menerus ketika
+    jumlah dari Reddit turun (komentar dihapus) atau data posts lebih baru.
+    """
+    rows = [[comment.get(c) for c in COMMENT_COLUMNS] for comment in comments]
+    with conn:
+        conn.execute("DELETE FROM comments WHERE post_id = ?", (post_id,))
+        conn.executemany(
+            f"INSERT INTO comments ({', '.join(COMMENT_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(COMMENT_COLUMNS))})",
+            rows
+        )
+        conn.execute(
+            "INSERT INTO comment_crawls (post_id, num_comments, crawled_at) "
+            "VALUES (?, MAX(?, COALESCE((SELECT num_comments FROM posts WHERE id = ?), 0)), "
+            "datetime('now')) "
+            "ON CONFLICT(post_id) DO UPDATE SET "
+            "num_comments = excluded.num_comments, crawled_at = excluded.crawled_at, "
+            "failed_attempts = 0, last_error = NULL",
+            (post_id, num_comments, post_id)
+        )
+
+
+def record_comment_crawl_failure(conn, post_id, error):
+    """
+    Mencatat percobaan crawl yang gagal untuk satu postingan.
+
+    num_comments dari crawl terakhir yang berhasil tetap dipertahankan. Setelah
+    COMMENT_MAX_ATTEMPTS kegagalan berturut-turut, postingan tidak lagi
+    dikembalikan oleh posts_needing_comment_crawl.
+
+    Args:
+        conn: Koneksi dari connect()
+        post_id: ID postingan
+        error: Pesan error
+    """
+    with conn:
+        conn.execute(
+            "INSERT INTO comment_crawls (post_id, crawled_at, failed_attempts, last_error) "
+            "VALUES (?, datetime('now'), 1, ?) "
+            "ON CONFLICT(post_id) DO UPDATE SET "
+            "crawled_at = excluded.crawled_at, failed_attempts = failed_attempts + 1, "
+            "last_error = excluded.last_error",
+            (post_id, error)
+        )
+
+
+def posts_needing_comment_crawl(db_path=DB_PATH, limit=None, max_attempts=COMMENT_MAX_ATTEMPTS):
+    """
+    Mencari postingan yang belum pernah di-crawl atau komentarnya bertambah.
+
+    Postingan yang sudah gagal max_attempts kali berturut-turut dilewati.
+
+    Args:
+        db_path: Path file database SQLite
+        limit: Jumlah maksimal postingan
+        max_attempts: Batas percobaan yang gagal per postingan
+
+    Returns:
+        List ID postingan, diurutkan dari jumlah komentar terbanyak
+    """
+    sql = (
+        "SELECT p.id FROM posts p LEFT JOIN comment_crawls c ON c.post_id = p.id "
+        "WHERE p.num_comments > 0 AND COALESCE(c.failed_attempts, 0) < ? "
+        "AND (c.num_comments IS NULL OR p.num_comments > c.num_comments) "
+        "ORDER BY p.num_comments DESC"
+    )
+    params = [int(max_attempts)]
+    if limit is not None:
+        sql += " LIMIT ?"
+        params.append(int(limit))
+
+    conn = connect(db_path)
+    try:
+        return [row[0] for row in conn.execute(sql, params)]
+    finally:
+        conn.close()
+
+
+def query_comments(post_id=None, db_path=DB_PATH, max_depth=None):
+    """
+    Mengambil komentar dari store.
+
+    Args:
+        post_id: ID postingan (default: semua postingan)
+        db_path: Path file database SQLite
+        max_depth: Kedalaman maksimal komentar (0 = komentar tingkat atas)
+
+    Returns:
+        DataFrame berisi komentar
+    """
+    conditions = []
+    params = []
+    if post_id is not None:
+        conditions.append("post_id = ?")
+        params.append(post_id)
+    if max_depth is not None:
+        conditions.append("depth <= ?")
+        params.append(max_depth)
+
+    sql = f"SELECT {', '.join(COMMENT_COLUMNS)} FROM comments"
+    if conditions:
+        sql += " WHERE " + " AND ".join(conditions)
+
+    conn = connect(db_path)
+    try:
+        return pd.read_sql_query(sql, conn, params=params)
+    finally:
+        conn.close()
+
+
+def store_exists(db_path=DB_PATH):
+    """Mengecek apakah store sudah dibuat."""
+    return os.path.exists(db_path)
+
+
+if __name__ == "__main__":
+    import_csv()
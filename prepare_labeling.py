@@ -6,26 +6,39 @@ Mempersiapkan data untuk pelabelan manual
 import pandas as pd
 import os
 
+from post_store import DB_PATH, query_posts, store_exists
+
 def prepare_data_for_labeling(
-    input_filename='data/reddit_posts.csv', 
+    input_filename=None, 
     output_filename='data/reddit_posts_to_label.csv', 
-    num_samples=300
+    num_samples=300,
+    db_path=DB_PATH
 ):
     """
     Memuat data, memilih sampel, dan menyiapkannya untuk pelabelan
     
     Args:
-        input_filename: File CSV input
+        input_filename: File CSV input (default: store jika ada, selain itu data/reddit_posts.csv)
         output_filename: File CSV output
         num_samples: Jumlah sampel yang akan dipilih
+        db_path: Store terindeks; dipakai jika input_filename tidak diberikan
     """
     try:
-        # Load data
-        df = pd.read_csv(input_filename)
-        print(f"✅ Berhasil memuat {len(df)} postingan dari {input_filename}")
-        
-        # Filter postingan yang memiliki body
-        df_with_body = df[df['body'].notna() & (df['body'].str.len() > 20)]
+        if input_filename is None and store_exists(db_path):
+            # Filter body langsung lewat indeks body_length; urut id agar sampel reprodusibel
+            df_with_body = query_posts(
+                db_path, columns=['id', 'title', 'body'], min_body_length=21,
+                order_by='id', ascending=True
+            )
+            print(f"✅ Berhasil memuat postingan dari store {db_path}")
+        else:
+            # Load data
+            input_filename = input_filename or 'data/reddit_posts.csv'
+            df = pd.read_csv(input_filename)
+            print(f"✅ Berhasil memuat {len(df)} postingan dari {input_filename}")
+            
+            # Filter postingan yang memiliki body
+            df_with_body = df[df['body'].notna() & (df['body'].str.len() > 20)]
         print(f"📊 Menemukan {len(df_with_body)} postingan dengan body yang signifikan")
         
         # Ambil sampel acak
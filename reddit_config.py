@@ -14,4 +14,12 @@ SUBREDDIT_NAME = "diabetes"
 MAX_POSTS = 1000
 
 # Time filter untuk postingan (hour, day, week, month, year, all)
-TIME_FILTER = "month" 
\ No newline at end of file
+TIME_FILTER = "month"
+
+# Pengambilan komentar (get_comments.py)
+# Kedalaman maksimal thread komentar (0 = hanya komentar tingkat atas)
+COMMENT_MAX_DEPTH = 5
+# Jumlah maksimal MoreComments yang di-expand per thread (None = expand semua)
+COMMENT_REPLACE_MORE_LIMIT = 32
+# Jumlah thread yang diproses bersamaan
+COMMENT_MAX_WORKERS = 8
@@ -5,10 +5,11 @@ Melatih model klasifikasi teks untuk mengkategorikan postingan Reddit.
 
 import pandas as pd
 import numpy as np
-import re
 import joblib
 import os
-import spacy
+
+from parallel_preprocess import ensure_spacy_model, plan_shards, preprocess_parallel
+from monitoring import save_training_distribution
 
 from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
@@ -24,40 +25,7 @@ MODEL_FILENAME = 'diabetes_classifier.pkl'
 VECTORIZER_FILENAME = 'tfidf_vectorizer.pkl'
 TEST_SIZE = 0.2
 RANDOM_STATE = 42
-
-# Muat model spaCy
-try:
-    nlp = spacy.load("en_core_web_sm")
-except OSError:
-    print("Model 'en_core_web_sm' tidak ditemukan. Mengunduh...")
-    os.system("python -m spacy download en_core_web_sm")
-    nlp = spacy.load("en_core_web_sm")
-
-
-def preprocess_text(text):
-    """
-    Membersihkan dan memproses teks input menggunakan spaCy.
-    - Menghapus URL
-    - Lemmatisasi
-    - Menghapus stopwords dan tanda baca
-    """
-    if not isinstance(text, str):
-        return ""
-    
-    # Hapus URL terlebih dahulu
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)
-    
-    # Proses teks dengan spaCy
-    doc = nlp(text)
-    
-    # Lemmatisasi dan hapus stopwords/tanda baca
-    tokens = [
-        token.lemma_.lower().strip() 
-        for token in doc 
-        if not token.is_stop and not token.is_punct and len(token.lemma_.strip()) > 2
-    ]
-    
-    return " ".join(tokens)
+N_WORKERS = os.cpu_count()
 
 def plot_confusion_matrix(y_true, y_pred, classes, filename):
     """Membuat dan menyimpan confusion matrix."""
@@ -89,8 +57,10 @@ def main():
     df['text_to_process'] = df['title'] + ' ' + df['body']
     print(f"Jumlah data setelah membersihkan nilai kosong: {len(df)}")
 
-    print("\n🔄 Memproses teks dengan spaCy...")
-    df['processed_text'] = df['text_to_process'].apply(preprocess_text)
+    n_workers, _ = plan_shards(len(df), N_WORKERS)
+    print(f"\n🔄 Memproses teks dengan spaCy ({n_workers} worker)...")
+    ensure_spacy_model()
+    df['processed_text'] = preprocess_parallel(df['text_to_process'].tolist(), n_workers=N_WORKERS)
     print("✅ Teks selesai diproses.")
 
     X = df['processed_text']
@@ -135,6 +105,7 @@ def main():
     joblib.dump(vectorizer, vectorizer_path)
     print(f"\n💾 Model berhasil disimpan di: {model_path}")
     print(f"💾 Vectorizer berhasil disimpan di: {vectorizer_path}")
+    save_training_distribution(y_train)
     
     print("\n✅ Proses pelatihan selesai!")
     print("🔄 Langkah selanjutnya: Membuat aplikasi demo dengan Streamlit.")